@@ -4,7 +4,14 @@ Generator of test images for system testing
 import numpy as np
 import cv2
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import argparse
+import os
+
+
+def _encode_png(filepath: str, img: np.ndarray) -> bool:
+    """Encodes and saves a single frame (executed in worker process)"""
+    return cv2.imwrite(filepath, img)
 
 
 def generate_test_sequence(output_folder: str, num_frames: int = 50, width: int = 640, height: int = 480):
@@ -27,28 +34,68 @@ def generate_test_sequence(output_folder: str, num_frames: int = 50, width: int
     center_y = height // 2
     radius = min(width, height) // 4
     
+    # Positions of moving circle for all frames (circular motion)
+    angles = np.arange(num_frames) * 2 * np.pi / num_frames
+    circle_xs = (center_x + radius * np.cos(angles)).astype(np.int32)
+    circle_ys = (center_y + radius * np.sin(angles)).astype(np.int32)
+    
+    # PNG encoding dominates runtime, so frames are encoded in parallel.
+    # At most max_pending frames are in flight, so memory does not grow
+    # with the number of frames.
+    num_workers = os.cpu_count() or 1
+    max_pending = 2 * num_workers
+    executor = ProcessPoolExecutor(max_workers=num_workers)
+    pending = set()
+    done_count = 0
+    
+    def collect(futures):
+        """Checks finished encodes and reports progress"""
+        nonlocal done_count
+        for future in futures:
+            future.result()
+            done_count += 1
+            if done_count % 10 == 0:
+                print(f"  Generated {done_count}/{num_frames} frames")
+    
+    # Render static background once (black, grid)
+    static_bg = np.zeros((height, width, 3), dtype=np.uint8)
+    
+    # Draw grids (every 50th column and row)
+    static_bg[:, ::50] = (50, 50, 50)
+    static_bg[::50, :] = (50, 50, 50)
+    
+    # Render stationary rectangle once into a patch with its pixel mask.
+    # It is drawn over the moving circle, so it is pasted after the circle.
+    rect_layer = static_bg.copy()
+    rect_mask = np.zeros((height, width), dtype=np.uint8)
+    cv2.rectangle(rect_layer, (50, 50), (150, 150), (255, 0, 0), -1)
+    cv2.rectangle(rect_layer, (50, 50), (150, 150), (255, 255, 255), 2)
+    cv2.rectangle(rect_mask, (50, 50), (150, 150), 255, -1)
+    cv2.rectangle(rect_mask, (50, 50), (150, 150), 255, 2)
+    rect_ys, rect_xs = np.nonzero(rect_mask)
+    rect_roi = (slice(rect_ys.min(), rect_ys.max() + 1), slice(rect_xs.min(), rect_xs.max() + 1))
+    rect_patch = rect_layer[rect_roi]
+    rect_where = rect_mask[rect_roi][:, :, None] > 0
+    
     for i in range(num_frames):
-        # Create black background
-        img = np.zeros((height, width, 3), dtype=np.uint8)
+        # Wait for the oldest encodes before rendering more frames
+        if len(pending) >= max_pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(finished)
         
-        # Draw grids
-        for x in range(0, width, 50):
-            cv2.line(img, (x, 0), (x, height), (50, 50, 50), 1)
-        for y in range(0, height, 50):
-            cv2.line(img, (0, y), (width, y), (50, 50, 50), 1)
+        # Start from the static background. Each frame needs its own buffer
+        # because it is encoded asynchronously by the process pool.
+        img = static_bg.copy()
         
-        # Calculate position of moving circle (circular motion)
-        angle = (i / num_frames) * 2 * np.pi
-        circle_x = int(center_x + radius * np.cos(angle))
-        circle_y = int(center_y + radius * np.sin(angle))
+        circle_x = int(circle_xs[i])
+        circle_y = int(circle_ys[i])
         
         # Draw moving circle
         cv2.circle(img, (circle_x, circle_y), 30, (0, 255, 0), -1)
         cv2.circle(img, (circle_x, circle_y), 30, (255, 255, 255), 2)
         
         # Draw stationary rectangle
-        cv2.rectangle(img, (50, 50), (150, 150), (255, 0, 0), -1)
-        cv2.rectangle(img, (50, 50), (150, 150), (255, 255, 255), 2)
+        np.copyto(img[rect_roi], rect_patch, where=rect_where)
         
         # Add text with frame number
         text = f"Frame {i}"
@@ -62,10 +109,11 @@ def generate_test_sequence(output_folder: str, num_frames: int = 50, width: int
         # Save image
         filename = f"frame_{i:06d}.png"
         filepath = output_path / filename
-        cv2.imwrite(str(filepath), img)
-        
-        if (i + 1) % 10 == 0:
-            print(f"  Generated {i + 1}/{num_frames} frames")
+        pending.add(executor.submit(_encode_png, str(filepath), img))
+    
+    # Wait for the remaining frames to be written
+    with executor:
+        collect(wait(pending).done)
     
     print(f"✓ Successfully generated {num_frames} test images!")
     print(f"  Location: {output_path}")
@@ -86,6 +134,9 @@ def generate_gradient_sequence(output_folder: str, num_frames: int = 30):
     
     width, height = 640, 480
     
+    # Normalized horizontal position of each column
+    xs = np.arange(width, dtype=np.float32) / width
+    
     for i in range(num_frames):
         # Horizontal gradient
         img = np.zeros((height, width, 3), dtype=np.uint8)
@@ -93,9 +144,9 @@ def generate_gradient_sequence(output_folder: str, num_frames: int = 30):
         # Gradient changing over time
         phase = i / num_frames
         
-        for x in range(width):
-            intensity = int(255 * (x / width) * (0.5 + 0.5 * np.sin(phase * 2 * np.pi)))
-            img[:, x] = [intensity, intensity, intensity]
+        # Build one gradient row and broadcast it across rows and channels
+        row = (255.0 * xs * (0.5 + 0.5 * np.sin(phase * 2 * np.pi))).astype(np.uint8)
+        img[:] = row[None, :, None]
         
         # Add some edges
         cv2.rectangle(img, (200, 150), (440, 330), (255, 255, 255), 3)
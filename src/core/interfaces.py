@@ -77,3 +77,7 @@ class IDetectionAlgorithm(ABC):
     def get_parameters(self) -> Dict[str, Any]:
         """Returns algorithm parameters for UI display"""
         pass
+    
+    def is_lightweight(self) -> bool:
+        """Whether processing is cheap enough to run inline in the acquisition thread"""
+        return False
@@ -7,19 +7,32 @@ import numpy as np
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameData:
     """Represents a single frame with metadata"""
     frame: np.ndarray
-    timestamp: datetime
+    timestamp_ns: int  # time.time_ns() at capture/processing
     frame_number: int
     source_info: Optional[str] = None
     
-    def copy(self):
-        """Creates a copy of FrameData"""
+    @property
+    def timestamp(self) -> datetime:
+        """Returns timestamp as datetime"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
+    def copy(self, deep: bool = False):
+        """
+        Creates a copy of FrameData
+
+        Args:
+            deep: Whether to duplicate pixel data (default: share the read-only frame)
+        """
+        frame = self.frame
+        if deep and frame is not None:
+            frame = frame.copy()
         return FrameData(
-            frame=self.frame.copy() if self.frame is not None else None,
-            timestamp=self.timestamp,
+            frame=frame,
+            timestamp_ns=self.timestamp_ns,
             frame_number=self.frame_number,
             source_info=self.source_info
         )
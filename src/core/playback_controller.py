@@ -4,7 +4,6 @@ Playback controller
 from enum import Enum
 from typing import Optional, Callable
 from threading import Thread, Event, Lock
-import time
 
 
 class PlaybackState(Enum):
@@ -140,12 +139,13 @@ class PlaybackController:
     def _play_loop(self):
         """Playback loop (executed in separate thread)"""
         while not self._stop_event.is_set():
+            # Read FPS dynamically so changes take effect immediately
+            # (plain float read, no lock needed)
+            frame_time = 1.0 / self._fps
+
             with self._lock:
                 if self._state != PlaybackState.PLAYING:
                     break
-                
-                # Read FPS dynamically so changes take effect immediately
-                frame_time = 1.0 / self._fps
 
                 # Check if end reached
                 if self._total_frames is not None and self._current_frame >= self._total_frames - 1:
@@ -163,5 +163,5 @@ class PlaybackController:
             if self._frame_callback:
                 self._frame_callback(current_frame)
             
-            # Wait appropriate time (based on current FPS)
-            time.sleep(frame_time)
+            # Wait appropriate time (based on current FPS); returns early on pause/stop
+            self._stop_event.wait(timeout=frame_time)
@@ -1,11 +1,10 @@
 """
 Image processing pipeline with multi-threading
 """
-from typing import Optional, Callable
-from threading import Thread, Lock
-from queue import Queue, Empty
+from typing import Optional, Callable, NamedTuple
+from threading import Thread, Lock, Event
+from collections import deque
 import time
-from datetime import datetime
 
 from .interfaces import IDataSource, IDetectionAlgorithm
 from .models import FrameData
@@ -13,6 +12,13 @@ from .ring_buffer import FrameRingBuffer
 from .recording_service import RecordingService
 
 
+class _AlgorithmBinding(NamedTuple):
+    """Per-frame lookups of the current algorithm"""
+    process: Callable
+    name: str
+    lightweight: bool
+
+
 class ProcessingPipeline:
     """Acquisition and processing pipeline with multi-threading"""
 
@@ -28,14 +34,16 @@ class ProcessingPipeline:
         """
         self.data_source = data_source
         self.algorithm = algorithm
+        self._bind_algorithm(algorithm)
         
         # Buffers
         self.source_buffer = FrameRingBuffer(buffer_size)
         self.processed_buffer = FrameRingBuffer(buffer_size)
         
-        # Queues between threads
-        self.acquisition_queue = Queue(maxsize=10)
-        self.processing_queue = Queue(maxsize=10)
+        # Single-slot handoff to processing (only the newest frame matters;
+        # appending to a full deque drops the older frame)
+        self._pending_frames: deque[FrameData] = deque(maxlen=1)
+        self._frame_ready = Event()
         
         # Threads
         self.acquisition_thread: Optional[Thread] = None
@@ -45,12 +53,19 @@ class ProcessingPipeline:
         self.is_running = False
         self.lock = Lock()
         
+        # Latest processed pair published as one tuple, so readers get a
+        # matching (sequence number, source, processed) without locking
+        self._latest_frames: tuple[int, Optional[FrameData], Optional[FrameData]] = (0, None, None)
+        
         # Callbacks
         self.on_new_frame: Optional[Callable[[FrameData, FrameData], None]] = None
         
         # Recording
         self.recording_service = RecordingService()
         
+        # Data source name (set on start)
+        self._source_name = "Unknown"
+        
         # Statistics
         self.frames_acquired = 0
         self.frames_processed = 0
@@ -71,6 +86,9 @@ class ProcessingPipeline:
                 self.data_source.close()
                 return False
             
+            # Source name is constant, so don't query get_info() per frame
+            self._source_name = self.data_source.get_info().get("name", "Unknown")
+            
             self.is_running = True
             
             # Start threads
@@ -105,34 +123,52 @@ class ProcessingPipeline:
     
     def _acquisition_loop(self):
         """Acquisition loop (separate thread)"""
+        # Bind loop-invariant lookups once
+        read_frame = self.data_source.read_frame
+        source_buffer_add = self.source_buffer.add
+        pending_frames = self._pending_frames
+        frame_ready = self._frame_ready
+        process_frame = self._process_frame
+        
         while self.is_running:
             start_time = time.time()
             
             # Read frame
-            frame = self.data_source.read_frame()
+            frame = read_frame()
             
             if frame is not None:
+                # Buffered frames are shared, so downstream consumers must not mutate them
+                frame.setflags(write=False)
+
                 # Create FrameData
                 frame_data = FrameData(
                     frame=frame,
-                    timestamp=datetime.now(),
+                    timestamp_ns=time.time_ns(),
                     frame_number=self.frames_acquired,
-                    source_info=self.data_source.get_info().get("name", "Unknown")
+                    source_info=self._source_name
                 )
                 
                 # Add to source buffer
-                self.source_buffer.add(frame_data)
-                
-                # Pass to processing
-                try:
-                    self.processing_queue.put(frame_data, block=False)
-                except:
-                    pass  # Queue full, skip
+                source_buffer_add(frame_data)
 
                 self.frames_acquired += 1
                 
                 # Statistics
                 self.last_acquisition_time = time.time() - start_time
+                
+                # One read of the binding, so the flag and the function
+                # always belong to the same algorithm
+                algorithm = self._algorithm
+                if algorithm.lightweight:
+                    # Cheap algorithms run inline, skipping the thread handoff
+                    try:
+                        process_frame(frame_data, algorithm)
+                    except Exception as e:
+                        print(f"Error processing frame: {e}")
+                else:
+                    # Pass to processing (replaces a frame not yet picked up)
+                    pending_frames.append(frame_data)
+                    frame_ready.set()
             else:
                 # No frame - wait a bit
                 time.sleep(0.01)
@@ -140,48 +176,61 @@ class ProcessingPipeline:
 
     def _processing_loop(self):
         """Processing loop (separate thread)"""
+        # Bind loop-invariant lookups once
+        pending_frames = self._pending_frames
+        frame_ready = self._frame_ready
+        process_frame = self._process_frame
+        
         while self.is_running:
             try:
                 # Get frame to process
-                frame_data = self.processing_queue.get(timeout=0.1)
-                
-                start_time = time.time()
-                
-                # Process frame
-                processed_frame = self.algorithm.process(frame_data.frame)
-                
-                # Create FrameData for processed frame
-                processed_data = FrameData(
-                    frame=processed_frame,
-                    timestamp=datetime.now(),
-                    frame_number=frame_data.frame_number,
-                    source_info=self.algorithm.get_name()
-                )
-                
-                # Add to processed buffer
-                self.processed_buffer.add(processed_data)
-                
-                # Record processed frame if active
-                if self.recording_service.is_recording_active():
-                    self.recording_service.record_frame(processed_frame)
-
-                self.frames_processed += 1
-                
-                # Statistics
-                self.last_processing_time = time.time() - start_time
+                if not frame_ready.wait(timeout=0.1):
+                    continue
+                frame_ready.clear()
+                if not pending_frames:
+                    continue
+                frame_data = pending_frames.popleft()
                 
-                # Call callback
-                if self.on_new_frame:
-                    try:
-                        self.on_new_frame(frame_data, processed_data)
-                    except Exception as e:
-                        print(f"Error in callback: {e}")
+                process_frame(frame_data, self._algorithm)
                 
-            except Empty:
-                continue
             except Exception as e:
                 print(f"Error in processing loop: {e}")
     
+    def _process_frame(self, frame_data: FrameData, algorithm: _AlgorithmBinding):
+        """Processes a single source frame and publishes the result"""
+        start_time = time.time()
+        
+        # Process frame
+        processed_frame = algorithm.process(frame_data.frame)
+        
+        # Create FrameData for processed frame
+        processed_data = FrameData(
+            frame=processed_frame,
+            timestamp_ns=time.time_ns(),
+            frame_number=frame_data.frame_number,
+            source_info=algorithm.name
+        )
+        
+        # Add to processed buffer
+        self.processed_buffer.add(processed_data)
+        
+        # Record processed frame if active
+        if self.recording_service.is_recording_active():
+            self.recording_service.record_frame(processed_frame)
+
+        self.frames_processed += 1
+        self._latest_frames = (self.frames_processed, frame_data, processed_data)
+        
+        # Statistics
+        self.last_processing_time = time.time() - start_time
+        
+        # Call callback
+        if self.on_new_frame:
+            try:
+                self.on_new_frame(frame_data, processed_data)
+            except Exception as e:
+                print(f"Error in callback: {e}")
+    
     def get_latest_frames(self) -> tuple[Optional[FrameData], Optional[FrameData]]:
         """
         Returns latest frames (source and processed)
@@ -193,6 +242,20 @@ class ProcessingPipeline:
         processed = self.processed_buffer.get_latest()
         return source, processed
     
+    def get_latest_frames_atomic(self) -> tuple[int, Optional[FrameData], Optional[FrameData]]:
+        """
+        Returns latest processed frame pair with its sequence number
+
+        The pair is read in one step, so source and processed frames always
+        belong together. The frames are shared with the ring buffers, not
+        copied, and must not be modified.
+
+        Returns:
+            Tuple (sequence_number, source_frame, processed_frame);
+            sequence number 0 means nothing has been processed yet
+        """
+        return self._latest_frames
+    
     def get_frame_by_number(self, frame_number: int) -> tuple[Optional[FrameData], Optional[FrameData]]:
         """
         Returns frames with specified number
@@ -223,3 +286,14 @@ class ProcessingPipeline:
         """Changes processing algorithm"""
         with self.lock:
             self.algorithm = algorithm
+            self._bind_algorithm(algorithm)
+    
+    def _bind_algorithm(self, algorithm: IDetectionAlgorithm):
+        """Caches per-frame lookups of the algorithm used by the worker loops"""
+        # Published as one tuple, so the worker threads never pair one
+        # algorithm's function with another's name or flag
+        self._algorithm = _AlgorithmBinding(
+            process=algorithm.process,
+            name=algorithm.get_name(),
+            lightweight=algorithm.is_lightweight()
+        )
@@ -2,24 +2,60 @@
 Recording service for camera stream
 """
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Literal
 from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+import os
 import cv2
 import numpy as np
 
 
+def _encode_and_write(filepath: str, frame_bgr: np.ndarray) -> bool:
+    """Encodes BGR frame and saves it as PNG (executed in worker thread)"""
+    return cv2.imwrite(filepath, frame_bgr)
+
+
 class RecordingService:
-    """Service for recording frames to PNG sequence"""
+    """Service for recording frames to PNG sequence or lossless video"""
+
+    VIDEO_FILENAME = "recording.mkv"
 
-    def __init__(self, output_folder: str = "recordings"):
+    def __init__(self, output_folder: str = "recordings", max_pending: int = 64,
+                 mode: Literal["png", "video"] = "png", fps: float = 30.0):
         """
         Args:
             output_folder: Base folder for recordings
+            max_pending: Maximum number of frames waiting to be written
+            mode: "png" (one PNG per frame) or "video" (single FFV1 video file)
+            fps: Frame rate stored in video recordings
         """
         self.output_folder = Path(output_folder)
         self.current_recording_folder: Optional[Path] = None
         self.frame_counter = 0
+        # Frames actually written (PNG writes are counted when they finish)
+        self.frames_saved = 0
         self.is_recording = False
+        self.mode = mode
+        self.fps = fps
+        
+        # Frame file path prefix of current recording ("<folder>/frame_")
+        self._path_prefix = ""
+        
+        # Video writer (created on first frame, when frame size is known)
+        self._video_writer: Optional[cv2.VideoWriter] = None
+        
+        # PNG encoding runs in worker threads (OpenCV releases the GIL);
+        # the pool exists only while a PNG recording is active
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # (file path, write future) in submission order
+        self._pending: deque[tuple[str, Future]] = deque()
+        self._max_pending = max_pending
+        
+        # record_frame runs on the pipeline threads, start/stop on the UI
+        # thread; the lock fences recording state, pending writes and the pool
+        self._lock = Lock()
     
     def start_recording(self, name: Optional[str] = None) -> str:
         """
@@ -31,20 +67,27 @@ class RecordingService:
         Returns:
             Path to recording folder
         """
-        if self.is_recording:
+        with self._lock:
+            if self.is_recording:
+                return str(self.current_recording_folder)
+            
+            # Create folder for recording
+            if name is None:
+                name = datetime.now().strftime("recording_%Y%m%d_%H%M%S")
+            
+            self.current_recording_folder = self.output_folder / name
+            self.current_recording_folder.mkdir(parents=True, exist_ok=True)
+            self._path_prefix = str(self.current_recording_folder) + os.sep + "frame_"
+            
+            self.frame_counter = 0
+            self.frames_saved = 0
+            
+            if self.mode == "png":
+                self._pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) - 1))
+            
+            self.is_recording = True
+            
             return str(self.current_recording_folder)
-        
-        # Create folder for recording
-        if name is None:
-            name = datetime.now().strftime("recording_%Y%m%d_%H%M%S")
-        
-        self.current_recording_folder = self.output_folder / name
-        self.current_recording_folder.mkdir(parents=True, exist_ok=True)
-        
-        self.frame_counter = 0
-        self.is_recording = True
-        
-        return str(self.current_recording_folder)
     
     def record_frame(self, frame: np.ndarray) -> bool:
         """
@@ -54,44 +97,107 @@ class RecordingService:
             frame: Frame to save (RGB)
 
         Returns:
-            True if successful
+            True if the frame was written (video) or queued for writing (PNG)
         """
-        if not self.is_recording or self.current_recording_folder is None:
+        if not self.is_recording:
             return False
         
-        # Create filename with proper padding (0000.png, 0001.png, etc.)
-        filename = f"frame_{self.frame_counter:06d}.png"
-        filepath = self.current_recording_folder / filename
-        
-        # OpenCV requires BGR
-        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        
-        # Save image
-        success = cv2.imwrite(str(filepath), frame_bgr)
+        # OpenCV requires BGR. Reversing the channel axis and making it contiguous
+        # is a single copy, which also lets the caller reuse its buffer while
+        # the frame is encoded.
+        frame_bgr = np.ascontiguousarray(frame[..., ::-1])
         
-        if success:
+        with self._lock:
+            # Recording may have been stopped since the check above
+            if not self.is_recording or self.current_recording_folder is None:
+                return False
+            
+            if self.mode == "video":
+                return self._record_video_frame(frame_bgr)
+            
+            if self._pool is None:
+                return False
+            
+            # Create filename with proper padding (0000.png, 0001.png, etc.)
+            filepath = f"{self._path_prefix}{self.frame_counter:06d}.png"
+            
+            # Wait for the oldest write when too many are pending (back-pressure)
+            while len(self._pending) >= self._max_pending:
+                self._collect_oldest_write()
+            
+            self._pending.append((filepath, self._pool.submit(_encode_and_write, filepath, frame_bgr)))
             self.frame_counter += 1
         
-        return success
+        return True
     
     def stop_recording(self) -> tuple[str, int]:
         """
         Stops recording
 
         Returns:
-            Tuple (folder path, number of frames recorded)
+            Tuple (folder path, number of frames saved)
         """
-        if not self.is_recording:
-            return "", 0
+        with self._lock:
+            if not self.is_recording:
+                return "", 0
+            
+            # Callers of record_frame re-check this under the lock, so no
+            # write can be submitted once it is cleared
+            folder_path = str(self.current_recording_folder)
+            self.is_recording = False
+            
+            # Wait for pending writes
+            while self._pending:
+                self._collect_oldest_write()
+            
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            
+            if self._video_writer is not None:
+                self._video_writer.release()
+                self._video_writer = None
+            
+            frames_recorded = self.frames_saved
+            self.current_recording_folder = None
+            self.frame_counter = 0
+            self.frames_saved = 0
         
-        folder_path = str(self.current_recording_folder)
-        frames_recorded = self.frame_counter
+        return folder_path, frames_recorded
+    
+    def _collect_oldest_write(self):
+        """Waits for the oldest pending PNG write and counts it if it succeeded (caller holds the lock)"""
+        filepath, future = self._pending.popleft()
+        try:
+            saved = future.result()
+        except Exception as e:
+            print(f"Failed to write frame {filepath}: {e}")
+            return
         
-        self.is_recording = False
-        self.current_recording_folder = None
-        self.frame_counter = 0
+        if saved:
+            self.frames_saved += 1
+        else:
+            print(f"Failed to write frame: {filepath}")
+    
+    def _record_video_frame(self, frame_bgr: np.ndarray) -> bool:
+        """Appends BGR frame to the recording's video file (caller holds the lock)"""
+        if self._video_writer is None:
+            height, width = frame_bgr.shape[:2]
+            video_path = self.current_recording_folder / self.VIDEO_FILENAME
+            # FFV1 is lossless, so recordings keep the same pixels as PNG
+            self._video_writer = cv2.VideoWriter(
+                str(video_path), cv2.VideoWriter_fourcc(*"FFV1"), self.fps, (width, height)
+            )
+            if not self._video_writer.isOpened():
+                print(f"Failed to open video writer: {video_path}")
+                self._video_writer = None
+                return False
         
-        return folder_path, frames_recorded
+        self._video_writer.write(frame_bgr)
+        self.frame_counter += 1
+        self.frames_saved += 1
+        
+        return True
     
     def is_recording_active(self) -> bool:
         """Whether recording is active"""
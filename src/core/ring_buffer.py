@@ -1,9 +1,9 @@
 """
 Ring buffer do przechowywania klatek
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 from threading import Lock
-from collections import deque
+import numpy as np
 from .models import FrameData
 
 
@@ -16,13 +16,39 @@ class FrameRingBuffer:
             capacity: Maksymalna liczba klatek w buforze
         """
         self.capacity = capacity
-        self._buffer: deque[FrameData] = deque(maxlen=capacity)
+        # Sloty o stałym rozmiarze; _head wskazuje slot następnego zapisu
+        self._frames: List[Optional[FrameData]] = [None] * capacity
+        self._head = 0
+        # Numery klatek przechowywane kolumnowo, równolegle do slotów
+        self._frame_numbers = np.full(capacity, -1, dtype=np.int64)
+        # Indeks numer klatki -> klatka (dostęp O(1))
+        self._index: Dict[int, FrameData] = {}
+        # Najnowsza klatka i rozmiar czytane bez blokady (przypisanie atomowe pod GIL)
+        self._latest: Optional[FrameData] = None
+        self._size = 0
         self._lock = Lock()
     
+    def _slot(self, index: int) -> int:
+        """Zamienia indeks względem najstarszej klatki na numer slotu"""
+        return (self._head - self._size + index) % self.capacity
+    
     def add(self, frame_data: FrameData):
         """Dodaje klatkę do bufora"""
         with self._lock:
-            self._buffer.append(frame_data)
+            slot = self._head
+            
+            # Usuń z indeksu klatkę, która zostanie nadpisana
+            oldest = self._frames[slot]
+            if oldest is not None and self._index.get(oldest.frame_number) is oldest:
+                del self._index[oldest.frame_number]
+            
+            self._frames[slot] = frame_data
+            self._frame_numbers[slot] = frame_data.frame_number
+            self._index[frame_data.frame_number] = frame_data
+            
+            self._head = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self._latest = frame_data
     
     def get(self, index: int) -> Optional[FrameData]:
         """
@@ -32,29 +58,22 @@ class FrameRingBuffer:
             index: Indeks względem najstarszej klatki (0 = najstarsza)
         """
         with self._lock:
-            if 0 <= index < len(self._buffer):
-                return self._buffer[index]
+            if 0 <= index < self._size:
+                return self._frames[self._slot(index)]
             return None
     
     def get_latest(self) -> Optional[FrameData]:
         """Pobiera najnowszą klatkę"""
-        with self._lock:
-            if len(self._buffer) > 0:
-                return self._buffer[-1]
-            return None
+        return self._latest
     
     def get_by_frame_number(self, frame_number: int) -> Optional[FrameData]:
         """Pobiera klatkę po numerze klatki"""
         with self._lock:
-            for frame_data in reversed(self._buffer):
-                if frame_data.frame_number == frame_number:
-                    return frame_data
-            return None
+            return self._index.get(frame_number)
     
     def get_size(self) -> int:
         """Zwraca aktualny rozmiar bufora"""
-        with self._lock:
-            return len(self._buffer)
+        return self._size
     
     def get_capacity(self) -> int:
         """Zwraca pojemność bufora"""
@@ -67,17 +86,26 @@ class FrameRingBuffer:
     def clear(self):
         """Czyści bufor"""
         with self._lock:
-            self._buffer.clear()
+            self._frames = [None] * self.capacity
+            self._frame_numbers.fill(-1)
+            self._index.clear()
+            self._head = 0
+            self._size = 0
+            self._latest = None
     
     def get_all_frame_numbers(self) -> List[int]:
         """Zwraca listę wszystkich numerów klatek w buforze"""
         with self._lock:
-            return [fd.frame_number for fd in self._buffer]
+            if self._size < self.capacity:
+                # Bufor niepełny - klatki leżą w slotach 0..size-1
+                return self._frame_numbers[:self._size].tolist()
+            return np.roll(self._frame_numbers, -self._head).tolist()
     
     def get_frame_range(self) -> tuple[Optional[int], Optional[int]]:
         """Zwraca zakres numerów klatek (min, max)"""
         with self._lock:
-            if len(self._buffer) == 0:
+            if self._size == 0:
                 return None, None
-            return self._buffer[0].frame_number, self._buffer[-1].frame_number
-
+            first = self._frame_numbers[self._slot(0)]
+            last = self._frame_numbers[self._slot(self._size - 1)]
+            return int(first), int(last)
@@ -2,6 +2,9 @@
 Camera data source implementation (OpenCV)
 """
 from typing import Optional, Dict, Any
+from threading import Thread, Event
+import os
+import sys
 import numpy as np
 import cv2
 from ..core.interfaces import IDataSource
@@ -10,6 +13,9 @@ from ..core.interfaces import IDataSource
 class CameraSource(IDataSource):
     """Camera data source"""
 
+    # Disable input buffering/probing in the FFMPEG backend (ignored by other backends)
+    FFMPEG_CAPTURE_OPTIONS = "fflags;nobuffer|flags;low_delay|probesize;32|analyzeduration;0"
+
     def __init__(self, camera_id: int = 0):
         """
         Args:
@@ -23,18 +29,35 @@ class CameraSource(IDataSource):
         self._height = 0
         self._fps = 30.0
 
+        # Grabber thread keeps the driver queue drained; only newest frame is kept.
+        # (sequence, frame) is published as one tuple, so a single reference
+        # store hands it over without a lock (atomic under the GIL).
+        self._latest: Optional[tuple[int, np.ndarray]] = None
+        self._served_seq = 0
+        self._frame_event = Event()
+        self._stop_event = Event()
+        self._grab_thread: Optional[Thread] = None
+
     def open(self) -> bool:
         """Opens camera connection"""
         try:
-            # Use default backend
-            self.capture = cv2.VideoCapture(self.camera_id)
+            os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", self.FFMPEG_CAPTURE_OPTIONS)
+
+            # On Linux prefer a GStreamer pipeline that always drops stale frames
+            self.capture = self._open_gstreamer() if sys.platform.startswith("linux") else None
+
+            if self.capture is None:
+                # Use default backend
+                self.capture = cv2.VideoCapture(self.camera_id)
 
-            if not self.capture.isOpened():
-                print(f"Failed to open camera {self.camera_id}")
-                return False
+                if not self.capture.isOpened():
+                    print(f"Failed to open camera {self.camera_id}")
+                    return False
 
-            # Configure camera for low latency
-            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # Configure camera for low latency (BUFFERSIZE is ignored by some backends)
+                self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # Compressed stream from the camera, avoids long format probing
+                self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
 
             # Get camera properties
             self._width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -57,30 +80,81 @@ class CameraSource(IDataSource):
                     pass
             return False
 
+    def _open_gstreamer(self) -> Optional[cv2.VideoCapture]:
+        """Opens camera through GStreamer with a single-frame, dropping appsink"""
+        pipeline = (
+            f"v4l2src device=/dev/video{self.camera_id} ! videoconvert ! "
+            "video/x-raw,format=BGR ! appsink drop=true max-buffers=1 sync=false"
+        )
+        capture = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if capture.isOpened():
+            return capture
+
+        # OpenCV built without GStreamer or device unavailable
+        capture.release()
+        return None
+
     def start(self) -> bool:
         """Starts acquisition"""
-        return self._is_opened
-    
-    def read_frame(self) -> Optional[np.ndarray]:
-        """Reads frame from camera"""
-        # Standard OpenCV pattern: while cap.isOpened() -> cap.read()
+        if not self._is_opened:
+            return False
+
+        if self._grab_thread is None or not self._grab_thread.is_alive():
+            self._stop_event.clear()
+            self._grab_thread = Thread(target=self._grab_loop, daemon=True)
+            self._grab_thread.start()
+
+        return True
+
+    def _grab_loop(self):
+        """Grabs frames continuously, keeping only the newest (separate thread)"""
+        seq = 0
+        while not self._stop_event.is_set():
+            try:
+                if not self.capture.grab():
+                    self._stop_event.wait(0.005)
+                    continue
+
+                success, img = self.capture.retrieve()
+                if not success or img is None or img.size == 0:
+                    continue
+            except Exception as e:
+                if self.frame_count == 0:
+                    print(f"Error reading first frame from camera {self.camera_id}: {e}")
+                self._stop_event.wait(0.01)
+                continue
+
+            seq += 1
+            self.frame_count += 1
+            self._latest = (seq, img)
+            self._frame_event.set()
+
+    def read_frame(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """
+        Returns the newest camera frame, waiting for one not returned before
+
+        Args:
+            timeout: Maximum time to wait for a new frame (seconds)
+        """
         if not self._is_opened or self.capture is None:
             return None
-        
-        if not self.capture.isOpened():
-            return None
 
-        try:
-            success, img = self.capture.read()
-            if success and img is not None and img.size > 0:
-                self.frame_count += 1
-                # OpenCV returns BGR, convert to RGB
-                return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            return None
-        except Exception as e:
-            if self.frame_count == 0:
-                print(f"Error reading first frame from camera {self.camera_id}: {e}")
-            return None
+        latest = self._latest
+        if latest is None or latest[0] == self._served_seq:
+            # Clear then re-check, so a frame published in between is not missed
+            self._frame_event.clear()
+            latest = self._latest
+            if latest is None or latest[0] == self._served_seq:
+                if not self._frame_event.wait(timeout):
+                    return None
+                latest = self._latest
+
+        seq, img = latest
+        self._served_seq = seq
+
+        # OpenCV returns BGR; reversing the channel axis gives an RGB view
+        # without copying (consumers must accept non-contiguous arrays)
+        return img[:, :, ::-1]
 
     def seek(self, position: int) -> bool:
         """Cameras don't support seeking"""
@@ -101,6 +175,11 @@ class CameraSource(IDataSource):
 
     def close(self):
         """Closes camera connection"""
+        self._stop_event.set()
+        if self._grab_thread is not None:
+            self._grab_thread.join(timeout=1.0)
+            self._grab_thread = None
+
         if self.capture is not None:
             try:
                 self.capture.release()
@@ -131,8 +210,6 @@ class CameraSource(IDataSource):
         Returns:
             List of available camera IDs
         """
-        import os
-
         # Suppress OpenCV errors during detection
         old_log_level = os.environ.get('OPENCV_LOG_LEVEL', '')
         os.environ['OPENCV_LOG_LEVEL'] = 'FATAL'
@@ -1,8 +1,11 @@
 """
 Implementacja źródła danych z plików DICOM
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import os
 import numpy as np
+import cv2
 import pydicom
 from pathlib import Path
 from ..core.interfaces import IDataSource
@@ -19,9 +22,15 @@ class DicomSource(IDataSource):
         self.path = Path(path)
         self.dicom_files: List[Path] = []
         self.datasets: List[pydicom.Dataset] = []
-        self.frames: List[np.ndarray] = []
+        # Wszystkie klatki w jednym ciągłym buforze uint8: (N, H, W) lub (N, H, W, 3)
+        self._buf: Optional[np.ndarray] = None
+        # Widok RGB (N, H, W, 3) na _buf - dla danych w skali szarości rozgłoszony (bez kopiowania)
+        self._rgb_view: Optional[np.ndarray] = None
         self.current_position = 0
         self._is_opened = False
+        # Pozycja ostatnio zwróconej klatki; ta sama klatka nie jest zwracana
+        # ponownie, dopóki pozycja się nie zmieni (pętla akwizycji czeka)
+        self._last_served: Optional[int] = None
     
     def open(self) -> bool:
         """Wczytuje pliki DICOM"""
@@ -40,99 +49,143 @@ class DicomSource(IDataSource):
             if len(self.dicom_files) == 0:
                 return False
             
-            # Wczytaj wszystkie pliki DICOM
-            for dcm_file in self.dicom_files:
-                try:
-                    ds = pydicom.dcmread(str(dcm_file))
-                    self.datasets.append(ds)
-                    
-                    # Sprawdź czy to multi-frame
-                    if hasattr(ds, 'NumberOfFrames') and ds.NumberOfFrames > 1:
-                        # Multi-frame DICOM
-                        pixel_array = ds.pixel_array
-                        for i in range(ds.NumberOfFrames):
-                            frame = pixel_array[i]
-                            self.frames.append(self._process_dicom_frame(frame, ds))
-                    else:
-                        # Single-frame DICOM
-                        frame = ds.pixel_array
-                        self.frames.append(self._process_dicom_frame(frame, ds))
-                        
-                except Exception as e:
-                    print(f"Error loading DICOM file {dcm_file}: {e}")
+            # Wczytaj wszystkie pliki DICOM równolegle jako paczki klatek (N, H, W[, 3]);
+            # dekodery pikseli zwalniają GIL
+            workers = min(8, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._load_one, self.dicom_files))
+            loaded = [result for result in results if result is not None]
+            
+            if len(loaded) == 0:
+                return False
+            
+            # Jeden bufor na wszystkie klatki o wymiarach pierwszego pliku
+            frame_shape = loaded[0][1].shape[1:]
+            total_frames = sum(len(frames) for _, frames in loaded if frames.shape[1:] == frame_shape)
+            self._buf = np.empty((total_frames, *frame_shape), dtype=np.uint8)
+            
+            position = 0
+            for ds, frames in loaded:
+                if frames.shape[1:] != frame_shape:
+                    print(f"Skipping DICOM frames with shape {frames.shape[1:]}, expected {frame_shape}")
                     continue
+                self._process_batch(frames, ds, self._buf[position:position + len(frames)])
+                self.datasets.append(ds)
+                position += len(frames)
             
-            self._is_opened = len(self.frames) > 0
+            if self._buf.ndim == 3:
+                self._rgb_view = np.broadcast_to(self._buf[..., np.newaxis], (*self._buf.shape, 3))
+            else:
+                self._rgb_view = self._buf
+            
+            self._is_opened = total_frames > 0
             return self._is_opened
             
         except Exception as e:
             print(f"Error opening DICOM source: {e}")
             return False
     
-    def _process_dicom_frame(self, pixel_array: np.ndarray, ds: pydicom.Dataset) -> np.ndarray:
+    def _load_one(self, dcm_file: Path) -> Optional[Tuple[pydicom.Dataset, np.ndarray]]:
         """
-        Przetwarza klatkę DICOM do formatu RGB/Grayscale
+        Wczytuje i dekoduje jeden plik DICOM (wykonywane w wątku roboczym)
         
-        Args:
-            pixel_array: Surowa tablica pikseli z DICOM
-            ds: Dataset DICOM z metadanymi
-            
         Returns:
-            Przetworzona klatka
+            Para (dataset, klatki o kształcie (N, H, W[, 3])) lub None przy błędzie
         """
-        # Normalizuj do 0-255
-        frame = pixel_array.astype(np.float32)
+        try:
+            # Duże elementy wczytywane dopiero przy dostępie
+            ds = pydicom.dcmread(str(dcm_file), defer_size="1 KB", force=True)
+            pixel_array = ds.pixel_array
+            
+            # Single-frame DICOM - dodaj wymiar klatek
+            if not (hasattr(ds, 'NumberOfFrames') and ds.NumberOfFrames > 1):
+                pixel_array = pixel_array[np.newaxis]
+            
+            return ds, pixel_array
+        except Exception as e:
+            print(f"Error loading DICOM file {dcm_file}: {e}")
+            return None
+    
+    def _process_batch(self, pixel_array: np.ndarray, ds: pydicom.Dataset, out: np.ndarray):
+        """
+        Przetwarza paczkę klatek DICOM (window/level) do uint8
         
+        Args:
+            pixel_array: Surowe klatki z DICOM, kształt (N, H, W[, 3])
+            ds: Dataset DICOM z metadanymi
+            out: Bufor wyjściowy uint8 o tym samym kształcie
+        """
         # Zastosuj window/level jeśli dostępne
-        if hasattr(ds, 'WindowCenter') and hasattr(ds, 'WindowWidth'):
+        has_window = hasattr(ds, 'WindowCenter') and hasattr(ds, 'WindowWidth')
+        if has_window:
             center = float(ds.WindowCenter) if not isinstance(ds.WindowCenter, pydicom.multival.MultiValue) else float(ds.WindowCenter[0])
             width = float(ds.WindowWidth) if not isinstance(ds.WindowWidth, pydicom.multival.MultiValue) else float(ds.WindowWidth[0])
             
             min_val = center - width / 2
             max_val = center + width / 2
-            
-            frame = np.clip(frame, min_val, max_val)
-            frame = ((frame - min_val) / (max_val - min_val) * 255.0)
         else:
             # Normalizacja bez window/level
-            min_val = frame.min()
-            max_val = frame.max()
-            if max_val > min_val:
-                frame = ((frame - min_val) / (max_val - min_val) * 255.0)
+            min_val = float(pixel_array.min())
+            max_val = float(pixel_array.max())
+        
+        # Normalizuj do 0-255
+        if max_val > min_val:
+            alpha = 255.0 / (max_val - min_val)
+            beta = -min_val * alpha
+        else:
+            alpha, beta = 1.0, 0.0
         
-        frame = frame.astype(np.uint8)
+        if pixel_array.dtype.kind in "iu" and pixel_array.dtype.itemsize <= 2:
+            # Dane 8/16-bitowe: tablica LUT dla wszystkich możliwych wartości,
+            # potem jedno przejście indeksowania prosto do bufora wyjściowego
+            unsigned = np.dtype(f"u{pixel_array.dtype.itemsize}")
+            values = np.arange(np.iinfo(unsigned).max + 1).astype(unsigned)
+            values = values.view(pixel_array.dtype).astype(np.float32)
+            np.clip(values, min_val, max_val, out=values)
+            if max_val > min_val:
+                # Ta sama formuła i obcięcie (bez zaokrąglania) co przy
+                # skalowaniu całych klatek, więc wynik 8-bitowy jest identyczny
+                values = (values - min_val) / (max_val - min_val) * 255.0
+            lut = values.astype(np.uint8)
+            np.take(lut, pixel_array.view(unsigned), out=out)
+            return
         
-        # Konwertuj do RGB jeśli grayscale
-        if len(frame.shape) == 2:
-            frame = np.stack([frame, frame, frame], axis=-1)
+        frames = pixel_array.astype(np.float32)
+        np.clip(frames, min_val, max_val, out=frames)
         
-        return frame
+        # Jedno przejście skalowania z nasyceniem (SIMD w OpenCV);
+        # OpenCV obsługuje maks. 2 wymiary + kanały, więc spłaszcz do (N*H, W*C)
+        rows = frames.shape[0] * frames.shape[1]
+        cv2.convertScaleAbs(frames.reshape(rows, -1), dst=out.reshape(rows, -1), alpha=alpha, beta=beta)
     
     def start(self) -> bool:
         """Rozpoczyna akwizycję"""
         return self._is_opened
     
     def read_frame(self) -> Optional[np.ndarray]:
-        """Reads current frame at current_position"""
-        if not self._is_opened or self.current_position >= len(self.frames):
+        """Reads current frame at current_position (None if it was already returned)"""
+        position = self.current_position
+        if not self._is_opened or position >= len(self._buf) or position == self._last_served:
             return None
         
-        frame = self.frames[self.current_position]
-        return frame
+        self._last_served = position
+        return self._rgb_view[position]
     
     def seek(self, position: int) -> bool:
         """Przewija do określonej klatki"""
         if not self._is_opened:
             return False
         
-        if 0 <= position < len(self.frames):
+        if 0 <= position < len(self._buf):
             self.current_position = position
+            # Przewinięcie (także na tę samą pozycję) zwraca klatkę ponownie
+            self._last_served = None
             return True
         return False
     
     def get_info(self) -> Dict[str, Any]:
         """Zwraca informacje o źródle DICOM"""
-        if not self._is_opened or len(self.frames) == 0:
+        if not self._is_opened or self._buf is None or len(self._buf) == 0:
             return {
                 "name": self.path.name,
                 "source_type": "dicom",
@@ -140,8 +193,7 @@ class DicomSource(IDataSource):
                 "height": 0
             }
         
-        first_frame = self.frames[0]
-        height, width = first_frame.shape[:2]
+        height, width = self._buf.shape[1:3]
         
         return {
             "name": self.path.name,
@@ -150,7 +202,7 @@ class DicomSource(IDataSource):
             "height": height,
             "fps": 30.0,  # Domyślne FPS
             "supports_seek": True,
-            "total_frames": len(self.frames),
+            "total_frames": len(self._buf),
             "color_mode": "RGB"
         }
     
@@ -158,7 +210,9 @@ class DicomSource(IDataSource):
         """Zamyka źródło danych"""
         self._is_opened = False
         self.current_position = 0
-        self.frames.clear()
+        self._last_served = None
+        self._buf = None
+        self._rgb_view = None
         self.datasets.clear()
     
     def supports_seek(self) -> bool:
@@ -167,7 +221,7 @@ class DicomSource(IDataSource):
     
     def get_total_frames(self) -> Optional[int]:
         """Zwraca liczbę klatek"""
-        return len(self.frames) if self._is_opened else None
+        return len(self._buf) if self._is_opened else None
     
     def get_current_position(self) -> int:
         """Zwraca aktualną pozycję"""
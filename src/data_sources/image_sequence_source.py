@@ -2,59 +2,183 @@
 Implementacja źródła danych z sekwencji obrazów PNG
 """
 from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import re
 import numpy as np
 import cv2
 from pathlib import Path
+from PIL import Image
 from ..core.interfaces import IDataSource
 
+try:
+    # Opcjonalnie: libjpeg-turbo dekoduje JPEG szybciej i bezpośrednio do RGB
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+
+
+def _natural_key(path: Path) -> list:
+    """Klucz sortowania naturalnego (frame2.png przed frame10.png)"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path.name)]
+
 
 class ImageSequenceSource(IDataSource):
     """Źródło danych z sekwencji obrazów PNG"""
     
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, prefetch_depth: int = 4, cache_bytes: int = 512 * 1024 * 1024):
         """
         Args:
             folder_path: Ścieżka do folderu z obrazami
+            prefetch_depth: Liczba kolejnych obrazów dekodowanych z wyprzedzeniem
+            cache_bytes: Limit pamięci (w bajtach) na zdekodowane obrazy w cache LRU
         """
         self.folder_path = Path(folder_path)
         self.image_files: List[Path] = []
         self.current_position = 0
         self._is_opened = False
+        # Wymiary obrazów (odczytane z nagłówka pierwszego pliku przy otwarciu)
+        self._width = 0
+        self._height = 0
+        
+        # Dekodowanie z wyprzedzeniem (OpenCV zwalnia GIL w imread)
+        self.prefetch_depth = prefetch_depth
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prefetched: Dict[int, Future] = {}
+        
+        # Pozycja ostatnio zwróconego obrazu; dopóki pozycja się nie zmieni
+        # (pauza, czas między klatkami odtwarzania), read_frame zwraca None,
+        # więc pętla akwizycji czeka zamiast powielać ten sam obraz
+        self._last_served: Optional[int] = None
+        
+        # Cache LRU zdekodowanych obrazów (pozycja -> klatka tylko do odczytu);
+        # przy zapętlonym odtwarzaniu i przewijaniu wstecz obraz nie jest dekodowany ponownie.
+        # Limit liczony w bajtach, więc duże obrazy nie zajmują wielokrotnie więcej pamięci
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_nbytes = 0
+        
+        # Dekoder JPEG (None jeśli PyTurboJPEG/libjpeg-turbo niedostępne)
+        self._turbo_jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbo_jpeg = TurboJPEG()
+            except Exception as e:
+                print(f"TurboJPEG unavailable, using OpenCV decoder: {e}")
     
     def open(self) -> bool:
         """Wczytuje listę plików PNG z folderu"""
         if not self.folder_path.exists() or not self.folder_path.is_dir():
             return False
         
-        # Wczytaj wszystkie pliki PNG, posortowane alfabetycznie
-        self.image_files = sorted(self.folder_path.glob("*.png"))
+        # Wczytaj wszystkie pliki PNG, posortowane naturalnie (numerycznie)
+        self.image_files = sorted(self.folder_path.glob("*.png"), key=_natural_key)
         
         if len(self.image_files) == 0:
             # Jeśli nie ma PNG, spróbuj JPG
-            self.image_files = sorted(self.folder_path.glob("*.jpg"))
-            self.image_files.extend(sorted(self.folder_path.glob("*.jpeg")))
+            self.image_files = sorted(self.folder_path.glob("*.jpg"), key=_natural_key)
+            self.image_files.extend(sorted(self.folder_path.glob("*.jpeg"), key=_natural_key))
         
         self._is_opened = len(self.image_files) > 0
+        
+        if self._is_opened:
+            # Odczytaj wymiary z nagłówka pierwszego obrazu (bez dekodowania pikseli)
+            try:
+                with Image.open(self.image_files[0]) as image:
+                    self._width, self._height = image.size
+            except Exception as e:
+                print(f"Error reading image header {self.image_files[0]}: {e}")
+                self._width, self._height = 0, 0
+        
         return self._is_opened
     
     def start(self) -> bool:
         """Rozpoczyna akwizycję"""
+        if self._is_opened and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.prefetch_depth))
         return self._is_opened
     
     def read_frame(self) -> Optional[np.ndarray]:
-        """Reads current image at current_position"""
-        if not self._is_opened or self.current_position >= len(self.image_files):
+        """Reads current image at current_position (None if it was already returned)"""
+        position = self.current_position
+        if not self._is_opened or position >= len(self.image_files):
             return None
         
-        image_path = self.image_files[self.current_position]
-        frame = cv2.imread(str(image_path))
+        # Obraz z tej pozycji został już zwrócony
+        if position == self._last_served:
+            return None
         
+        frame = self._cache.get(position)
         if frame is not None:
-            # OpenCV returns BGR, convert to RGB
-            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self._cache.move_to_end(position)
+            if self._executor is not None:
+                self._schedule_prefetch(position)
+            self._last_served = position
+            return frame
+        
+        if self._executor is None:
+            frame = self._load_frame(position)
+        else:
+            self._schedule_prefetch(position)
+            frame = self._prefetched[position].result()
+        
+        if frame is not None and frame.nbytes <= self.cache_bytes:
+            frame.setflags(write=False)
+            self._cache[position] = frame
+            self._cache_nbytes += frame.nbytes
+            # Usuń najdawniej używane obrazy, aż cache zmieści się w limicie
+            while self._cache_nbytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_nbytes -= evicted.nbytes
+        
+        if frame is not None:
+            self._last_served = position
+        
+        return frame
+    
+    def _load_frame(self, position: int) -> Optional[np.ndarray]:
+        """Wczytuje i dekoduje obraz o podanej pozycji"""
+        image_path = self.image_files[position]
+        
+        try:
+            if self._turbo_jpeg is not None and image_path.suffix.lower() in (".jpg", ".jpeg"):
+                # TurboJPEG zwraca od razu RGB
+                with open(image_path, "rb") as f:
+                    return self._turbo_jpeg.decode(f.read(), pixel_format=TJPF_RGB)
+            
+            with open(image_path, "rb") as f:
+                # Podpowiedź dla jądra: plik czytany sekwencyjnie (agresywny readahead)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                # Dekoduj z pliku zmapowanego w pamięci (bez kopiowania do bufora)
+                data = np.memmap(f, dtype=np.uint8, mode="r")
+                frame = cv2.imdecode(data, cv2.IMREAD_COLOR)
+        except (OSError, ValueError) as e:
+            print(f"Error reading image {image_path}: {e}")
+            return None
+        
+        if frame is not None:
+            # OpenCV returns BGR; reversing the channel axis gives an RGB view
+            # without copying (consumers must accept non-contiguous arrays)
+            return frame[:, :, ::-1]
         
         return None
     
+    def _schedule_prefetch(self, position: int):
+        """Zleca dekodowanie obrazów z okna [position, position + prefetch_depth]"""
+        window = range(position, min(position + self.prefetch_depth + 1, len(self.image_files)))
+        
+        # Porzuć obrazy spoza okna (np. po przewinięciu)
+        for pos in list(self._prefetched):
+            if pos not in window:
+                self._prefetched.pop(pos).cancel()
+        
+        for pos in window:
+            if pos not in self._prefetched and pos not in self._cache:
+                self._prefetched[pos] = self._executor.submit(self._load_frame, pos)
+    
     def seek(self, position: int) -> bool:
         """Przewija do określonego obrazu"""
         if not self._is_opened:
@@ -62,6 +186,8 @@ class ImageSequenceSource(IDataSource):
         
         if 0 <= position < len(self.image_files):
             self.current_position = position
+            # Przewinięcie (także na tę samą pozycję) zwraca obraz ponownie
+            self._last_served = None
             return True
         return False
     
@@ -75,15 +201,11 @@ class ImageSequenceSource(IDataSource):
                 "height": 0
             }
         
-        # Odczytaj pierwszy obraz aby poznać wymiary
-        first_image = cv2.imread(str(self.image_files[0]))
-        height, width = first_image.shape[:2] if first_image is not None else (0, 0)
-        
         return {
             "name": self.folder_path.name,
             "source_type": "image_sequence",
-            "width": width,
-            "height": height,
+            "width": self._width,
+            "height": self._height,
             "fps": 30.0,  # Domyślne FPS
             "supports_seek": True,
             "total_frames": len(self.image_files),
@@ -94,6 +216,14 @@ class ImageSequenceSource(IDataSource):
         """Zamyka źródło danych"""
         self._is_opened = False
         self.current_position = 0
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._prefetched.clear()
+        self._cache.clear()
+        self._cache_nbytes = 0
+        self._last_served = None
     
     def supports_seek(self) -> bool:
         """Sekwencje obrazów wspierają przewijanie"""
@@ -1,7 +1,8 @@
 """
 Algorytm konwolucji z wyborem maski
 """
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, Callable
 import numpy as np
 import cv2
 from ..core.interfaces import IDetectionAlgorithm
@@ -54,14 +55,116 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         ], dtype=np.float32),
         "Canny Edge Detection": "canny",  # Special marker for Canny algorithm
     }
+
+    # Faster equivalents of separable kernels (same output as filter2D)
+    BOX_KERNELS = {
+        "Average 3x3": (3, 3),
+        "Average 5x5": (5, 5),
+    }
+    SEPARABLE_KERNELS = {
+        "Gaussian 3x3": (np.array([1, 2, 1], dtype=np.float32) / 4.0,) * 2,
+        "Gaussian 5x5": (cv2.getGaussianKernel(5, -1),) * 2,
+    }
+    SOBEL_KERNELS = {
+        "Sobel X": (1, 0),
+        "Sobel Y": (0, 1),
+    }
+    # Kernels with a dedicated OpenCV function: name -> Laplacian ksize
+    LAPLACIAN_KERNELS = {
+        "Laplacian": 1,
+    }
+
+    # Kernels uploaded for OpenCL (T-API), created on first GPU use
+    KERNELS_UMAT: Dict[str, cv2.UMat] = {}
+
+    # Filter functions specialized per kernel, built on first selection
+    FILTERS: Dict[str, Callable] = {}
+
+    # Grayscale of the most recently converted frame, shared by all instances:
+    # (frame, gray). Frames are read-only, so identity is a valid cache key
+    _last_gray: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def _compile_kernels(cls):
+        """Convert numeric kernels to contiguous float32 once, at import time"""
+        for name, kernel in cls.KERNELS.items():
+            if isinstance(kernel, np.ndarray):
+                cls.KERNELS[name] = np.ascontiguousarray(kernel, dtype=np.float32)
+
+        # Kernel table is fixed from here on
+        cls.KERNELS = MappingProxyType(cls.KERNELS)
+
+    @classmethod
+    def _get_filter(cls, name: str) -> Optional[Callable]:
+        """
+        Get the filter function for a kernel, building it on first use
+
+        Args:
+            name: Kernel name
+
+        Returns:
+            Function filtering a single-channel image (ndarray or UMat),
+            or None for kernels without a filter (Canny)
+        """
+        filter_fn = cls.FILTERS.get(name)
+        if filter_fn is None and isinstance(cls.KERNELS[name], np.ndarray):
+            filter_fn = cls.FILTERS[name] = cls._compile_filter(name)
+        return filter_fn
+
+    @classmethod
+    def _compile_filter(cls, name: str) -> Callable:
+        """
+        Build a filter function with the kernel's operation and coefficients bound
+
+        Separable and special-purpose kernels use their dedicated OpenCV
+        function, all other kernels use filter2D. Output depth matches the input.
+
+        Args:
+            name: Kernel name
+
+        Returns:
+            Filter function
+        """
+        if name in cls.BOX_KERNELS:
+            ksize = cls.BOX_KERNELS[name]
+            return lambda gray: cv2.boxFilter(gray, -1, ksize)
+
+        if name in cls.SEPARABLE_KERNELS:
+            kx, ky = cls.SEPARABLE_KERNELS[name]
+            return lambda gray: cv2.sepFilter2D(gray, -1, kx, ky)
+
+        if name in cls.SOBEL_KERNELS:
+            dx, dy = cls.SOBEL_KERNELS[name]
+            return lambda gray: cv2.Sobel(gray, -1, dx, dy, ksize=3)
+
+        if name in cls.LAPLACIAN_KERNELS:
+            ksize = cls.LAPLACIAN_KERNELS[name]
+            return lambda gray: cv2.Laplacian(gray, -1, ksize=ksize)
+
+        kernel = cls.KERNELS[name]
+
+        def filter_2d(gray):
+            if isinstance(gray, cv2.UMat):
+                kernel_umat = cls.KERNELS_UMAT.get(name)
+                if kernel_umat is None:
+                    kernel_umat = cls.KERNELS_UMAT[name] = cv2.UMat(kernel)
+                return cv2.filter2D(gray, -1, kernel_umat)
+            return cv2.filter2D(gray, -1, kernel)
+
+        return filter_2d
     
     def __init__(self):
-        self.current_kernel_name = "Average 3x3"
-        self.current_kernel = self.KERNELS[self.current_kernel_name]
+        self._select_kernel("Average 3x3")
         self.normalize_output = True
         # Canny edge detection parameters
         self.canny_threshold1 = 50
         self.canny_threshold2 = 150
+        # Reusable grayscale scratch buffer (reallocated when frame size changes)
+        self._gray_buf: Optional[np.ndarray] = None
+        # Canny gradients memoized for the last input frame: (frame, dx, dy)
+        self._canny_gradients: Optional[tuple] = None
+        # Run filtering through OpenCL when available
+        self.use_gpu = False
 
     def configure(self, config: Dict[str, Any]) -> bool:
         """
@@ -73,12 +176,12 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
                 - normalize: whether to normalize output
                 - canny_threshold1: Canny lower threshold
                 - canny_threshold2: Canny upper threshold
+                - use_gpu: whether to filter on GPU via OpenCL (if available)
         """
         if "kernel_name" in config:
             kernel_name = config["kernel_name"]
             if kernel_name in self.KERNELS:
-                self.current_kernel_name = kernel_name
-                self.current_kernel = self.KERNELS[kernel_name]
+                self._select_kernel(kernel_name)
             else:
                 return False
         
@@ -91,6 +194,11 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         if "canny_threshold2" in config:
             self.canny_threshold2 = int(config["canny_threshold2"])
 
+        if "use_gpu" in config:
+            # Chosen per instance (UMat or ndarray path in _filter_image);
+            # the process-wide cv2.ocl.setUseOpenCL switch is left alone
+            self.use_gpu = bool(config["use_gpu"]) and cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
         return True
     
     def process(self, frame: np.ndarray) -> np.ndarray:
@@ -101,33 +209,56 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
             frame: Frame to process (RGB or Grayscale)
 
         Returns:
-            Processed frame
+            Processed frame (color input gives a read-only RGB view of the grayscale result)
         """
         if frame is None or frame.size == 0:
             return frame
         
-        # Check if Canny edge detection is selected (compare by name, not array)
-        if self.current_kernel_name == "Canny Edge Detection":
-            return self._apply_canny(frame)
+        return self._dispatch(frame)
+
+    def _select_kernel(self, kernel_name: str):
+        """
+        Select kernel and bind the matching processing method
+
+        Args:
+            kernel_name: Kernel name (must be in KERNELS)
+        """
+        self.current_kernel_name = kernel_name
+        self.current_kernel = self.KERNELS[kernel_name]
+        self._filter = self._get_filter(kernel_name)
+        # Resolved once here so process() does no name comparison per frame
+        if kernel_name == "Canny Edge Detection":
+            self._dispatch = self._apply_canny
+        else:
+            self._dispatch = self._apply_convolution
+
+    def _apply_convolution(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Apply current convolution kernel
 
-        # Standard convolution processing
+        Args:
+            frame: Input frame (RGB or Grayscale)
+
+        Returns:
+            Filtered frame
+        """
         # Check if image is color
         is_color = len(frame.shape) == 3 and frame.shape[2] == 3
         
         if is_color:
             # For color image, convert to grayscale, process, and return as RGB
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            result = cv2.filter2D(gray, -1, self.current_kernel)
+            gray = self._to_gray(frame)
+            result = self._filter_image(gray)
             
             # Normalize if needed
             if self.normalize_output:
                 result = self._normalize_image(result)
             
-            # Convert back to RGB
-            result = cv2.cvtColor(result, cv2.COLOR_GRAY2RGB)
+            # Expand back to RGB as a zero-copy view
+            result = self._gray_to_rgb_view(result)
         else:
             # Image already in grayscale
-            result = cv2.filter2D(frame, -1, self.current_kernel)
+            result = self._filter_image(frame)
             
             # Normalize if needed
             if self.normalize_output:
@@ -135,6 +266,47 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         
         return result
     
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert RGB frame to grayscale into the reusable scratch buffer
+
+        The conversion is skipped when the same frame was already converted
+        (by this or another instance).
+
+        Args:
+            frame: RGB frame
+
+        Returns:
+            Grayscale image (valid until the next call)
+        """
+        cached = ConvolutionAlgorithm._last_gray
+        if cached is not None and cached[0] is frame:
+            return cached[1]
+
+        shape = frame.shape[:2]
+        if self._gray_buf is None or self._gray_buf.shape != shape or self._gray_buf.dtype != frame.dtype:
+            self._gray_buf = np.empty(shape, dtype=frame.dtype)
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY, dst=self._gray_buf)
+        ConvolutionAlgorithm._last_gray = (frame, gray)
+        return gray
+
+    def _filter_image(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Apply current kernel on CPU or, if enabled, on GPU via OpenCL
+
+        Args:
+            gray: Single-channel input image
+
+        Returns:
+            Filtered image
+        """
+        if not self.use_gpu:
+            return self._filter(gray)
+
+        # Upload, filter and download only at the sink boundary
+        return self._filter(cv2.UMat(gray)).get()
+
     def _apply_canny(self, frame: np.ndarray) -> np.ndarray:
         """
         Apply Canny edge detection
@@ -145,21 +317,44 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         Returns:
             Edge detected frame
         """
-        # Convert to grayscale if needed
-        if len(frame.shape) == 3 and frame.shape[2] == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        is_color = len(frame.shape) == 3 and frame.shape[2] == 3
+
+        # Frames are read-only, so gradients of the same frame object can be
+        # reused (e.g. when only the thresholds change)
+        cached = self._canny_gradients
+        if cached is not None and cached[0] is frame:
+            _, dx, dy = cached
         else:
-            gray = frame
+            gray = self._to_gray(frame) if is_color else frame
+            # Same border handling as cv2.Canny(image) uses internally
+            dx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE)
+            dy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE)
+            self._canny_gradients = (frame, dx, dy)
 
-        # Apply Canny edge detection
-        edges = cv2.Canny(gray, self.canny_threshold1, self.canny_threshold2)
+        # Canny from precomputed 16-bit gradients (L1 norm)
+        edges = cv2.Canny(dx, dy, self.canny_threshold1, self.canny_threshold2, L2gradient=False)
 
-        # Convert back to RGB if input was RGB
-        if len(frame.shape) == 3 and frame.shape[2] == 3:
-            edges = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
+        # Expand back to RGB (zero-copy view) if input was RGB
+        if is_color:
+            edges = self._gray_to_rgb_view(edges)
 
         return edges
 
+    @staticmethod
+    def _gray_to_rgb_view(gray: np.ndarray) -> np.ndarray:
+        """
+        Expand grayscale image to 3 channels without copying
+
+        The result is a read-only broadcast view, consumers must not write into it.
+
+        Args:
+            gray: Single-channel image
+
+        Returns:
+            Read-only (H, W, 3) view of gray
+        """
+        return np.broadcast_to(gray[:, :, np.newaxis], (*gray.shape, 3))
+
     def _normalize_image(self, img: np.ndarray) -> np.ndarray:
         """
         Normalize image to 0-255 range
@@ -170,17 +365,19 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         Returns:
             Normalized image
         """
+        # uint8 results are already in range
+        if img.dtype == np.uint8:
+            return img
+
         # For operations that can produce negative values (Sobel, Laplacian)
-        if img.min() < 0 or img.max() > 255:
-            img_min = img.min()
-            img_max = img.max()
-            
+        img_min, img_max, _, _ = cv2.minMaxLoc(img)
+        if img_min < 0 or img_max > 255:
             if img_max > img_min:
-                img = ((img - img_min) / (img_max - img_min) * 255.0)
+                # Scale and saturate to uint8 in a single pass
+                alpha = 255.0 / (img_max - img_min)
+                img = cv2.convertScaleAbs(img, alpha=alpha, beta=-img_min * alpha)
             else:
-                img = np.zeros_like(img)
-            
-            img = img.astype(np.uint8)
+                img = np.zeros(img.shape, dtype=np.uint8)
         
         return img
     
@@ -201,6 +398,11 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
                 "type": "bool",
                 "value": self.normalize_output,
                 "label": "Normalize Output"
+            },
+            "use_gpu": {
+                "type": "bool",
+                "value": self.use_gpu,
+                "label": "Use GPU (OpenCL)"
             }
         }
 
@@ -228,3 +430,5 @@ class ConvolutionAlgorithm(IDetectionAlgorithm):
         """Returns list of available kernels"""
         return list(ConvolutionAlgorithm.KERNELS.keys())
 
+
+ConvolutionAlgorithm._compile_kernels()
@@ -9,16 +9,25 @@ from ..core.interfaces import IDetectionAlgorithm
 class NoProcessingAlgorithm(IDetectionAlgorithm):
     """Algorytm który nie przetwarza obrazu (zwraca oryginał)"""
     
-    def __init__(self):
+    def __init__(self, copy: bool = False):
+        """
+        Args:
+            copy: Zwracaj zapisywalną kopię zamiast widoku tylko do odczytu
+        """
         self.name = "No Processing"
+        self.copy = copy
     
     def configure(self, config: Dict[str, Any]) -> bool:
         """Brak konfiguracji"""
         return True
     
     def process(self, frame: np.ndarray) -> np.ndarray:
-        """Zwraca kopię oryginalnej klatki"""
-        return frame.copy()
+        """Zwraca widok tylko do odczytu (lub kopię) oryginalnej klatki"""
+        if self.copy:
+            return frame.copy()
+        view = frame.view()
+        view.flags.writeable = False
+        return view
     
     def get_name(self) -> str:
         """Zwraca nazwę algorytmu"""
@@ -27,4 +36,8 @@ class NoProcessingAlgorithm(IDetectionAlgorithm):
     def get_parameters(self) -> Dict[str, Any]:
         """Brak parametrów"""
         return {}
+    
+    def is_lightweight(self) -> bool:
+        """Przetwarzanie trywialne - wykonywane w wątku akwizycji"""
+        return True
 
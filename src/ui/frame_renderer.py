@@ -0,0 +1,127 @@
+"""
+Background conversion of frames to QImages
+"""
+from threading import Event, Lock
+import time
+from typing import Any, Dict, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+import numpy as np
+import cv2
+
+
+class FrameRenderer(QThread):
+    """
+    Worker thread that wraps numpy frames in QImages
+
+    QImage is safe to use outside the GUI thread (unlike QPixmap); scaling
+    is left to the display widget (see ImageView). Each target keeps at most
+    one pending frame: a newer frame replaces an older one that was not
+    rendered yet.
+    """
+
+    # (tag passed to submit, image, render time in ms); the image is sent as
+    # a Python object so the wrapper carrying _numpy_ref reaches the GUI
+    # thread intact
+    imageReady = pyqtSignal(object, object, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # target key -> (frame, tag)
+        self._pending: Dict[Any, Tuple[np.ndarray, Any]] = {}
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._running = True
+
+    def submit(self, key: Any, frame: np.ndarray, tag: Any):
+        """
+        Queue frame for rendering, replacing any pending frame for the same key
+
+        Args:
+            key: Display target identifier
+            frame: RGB (H, W, 3) or grayscale (H, W) uint8 frame
+            tag: Value emitted back with the rendered image
+        """
+        with self._lock:
+            self._pending[key] = (frame, tag)
+        self._wakeup.set()
+
+    def stop(self):
+        """Stop the worker thread and wait for it to finish"""
+        self._running = False
+        self._wakeup.set()
+        self.wait()
+
+    def run(self):
+        """Render pending frames until stopped"""
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            with self._lock:
+                jobs = list(self._pending.values())
+                self._pending.clear()
+
+            for frame, tag in jobs:
+                if not self._running:
+                    break
+                start = time.perf_counter()
+                image = self.render(frame)
+                self.imageReady.emit(tag, image, (time.perf_counter() - start) * 1000.0)
+
+    def wrap(self, frame: np.ndarray) -> QImage:
+        """
+        Wrap frame in a QImage, copying only when the layout requires it
+
+        Color frames are expanded to 32-bit pixels (Format_RGB32), which Qt
+        draws and uploads as textures without per-pixel conversion. The
+        image keeps a reference to the array backing it (_numpy_ref), so the
+        memory stays valid for as long as the image object is alive.
+
+        Args:
+            frame: RGB (H, W, 3) or grayscale (H, W) uint8 frame
+
+        Returns:
+            Image over the frame (or over a converted copy of it)
+        """
+        height, width = frame.shape[:2]
+
+        if len(frame.shape) == 3 and frame.strides[2] == 0:
+            # Grayscale broadcast to RGB (processed and DICOM frames): wrap the
+            # single plane as Grayscale8 instead of copying three channels
+            frame = frame[:, :, 0]
+
+        if len(frame.shape) == 3:
+            if frame.strides[2] < 0 and frame[:, :, ::-1].flags['C_CONTIGUOUS']:
+                # Channel-reversed view of OpenCV's BGR data (frame[:, :, ::-1]):
+                # convert from the BGR memory directly
+                source, code = frame[:, :, ::-1], cv2.COLOR_BGR2BGRA
+            else:
+                source, code = np.ascontiguousarray(frame), cv2.COLOR_RGB2BGRA
+
+            # RGB32 is 0xffRRGGBB, i.e. bytes B, G, R, 255 on little-endian.
+            # A new array per frame: the shown image keeps referencing it
+            frame = cv2.cvtColor(source, code)
+            image_format = QImage.Format.Format_RGB32
+        else:
+            # Copies only non-contiguous frames; the image owns the copy
+            frame = np.ascontiguousarray(frame)
+            image_format = QImage.Format.Format_Grayscale8
+
+        image = QImage(frame.data, width, height, frame.strides[0], image_format)
+        image._numpy_ref = frame
+        return image
+
+    def render(self, frame: np.ndarray) -> QImage:
+        """
+        Convert frame to a QImage that can be handed to the GUI thread
+
+        Args:
+            frame: RGB (H, W, 3) or grayscale (H, W) uint8 frame
+
+        Returns:
+            Image over the frame (frames are read-only, so it stays valid) or
+            over a converted copy that the image keeps alive
+        """
+        return self.wrap(frame)
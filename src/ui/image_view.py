@@ -0,0 +1,127 @@
+"""
+Image display widget scaling frames at paint time
+"""
+from typing import Optional
+
+from PyQt6.QtCore import Qt, QRect, QTimer
+from PyQt6.QtGui import QColor, QImage, QPainter, QOpenGLContext, QOffscreenSurface
+from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+from PyQt6.QtWidgets import QWidget
+
+
+class ImageView:
+    """
+    Widget showing the latest image scaled to fit, keeping aspect ratio
+
+    Use ImageView.create() to get a widget: an OpenGL-backed view when an
+    OpenGL context can be created, otherwise a raster QWidget.
+    """
+
+    BACKGROUND = QColor("#1a1a1a")
+    # Time after the last resize event before smooth scaling is used again
+    RESIZE_DEBOUNCE_MS = 100
+
+    # Whether OpenGL contexts can be created (checked once, on first view)
+    _opengl_available: Optional[bool] = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image: Optional[QImage] = None
+
+        # While the widget is being resized, paint with fast scaling
+        self._resizing = False
+        self._resize_debounce = QTimer(self)
+        self._resize_debounce.setSingleShot(True)
+        self._resize_debounce.setInterval(self.RESIZE_DEBOUNCE_MS)
+        self._resize_debounce.timeout.connect(self._on_resize_finished)
+
+    @classmethod
+    def create(cls, parent=None) -> "ImageView":
+        """
+        Create the best image view available on this system
+
+        Returns:
+            OpenGLImageView if an OpenGL context works, else RasterImageView
+        """
+        if ImageView._opengl_available is None:
+            ImageView._opengl_available = cls._check_opengl()
+
+        if ImageView._opengl_available:
+            return OpenGLImageView(parent)
+        return RasterImageView(parent)
+
+    @staticmethod
+    def _check_opengl() -> bool:
+        """Try to create and activate an OpenGL context"""
+        context = QOpenGLContext()
+        if not context.create():
+            print("OpenGL unavailable, using raster image display")
+            return False
+
+        surface = QOffscreenSurface()
+        surface.setFormat(context.format())
+        surface.create()
+        available = surface.isValid() and context.makeCurrent(surface)
+        if available:
+            context.doneCurrent()
+        else:
+            print("OpenGL context cannot be activated, using raster image display")
+        surface.destroy()
+        return available
+
+    def set_image(self, image: Optional[QImage]):
+        """
+        Show image (scaled on the next repaint)
+
+        Args:
+            image: Image to show, must stay valid while it is displayed
+        """
+        self._image = image
+        self.update()
+
+    def resizeEvent(self, event):
+        """Defer full-quality scaling until resizing settles"""
+        self._resizing = True
+        self._resize_debounce.start()
+        super().resizeEvent(event)
+
+    def _on_resize_finished(self):
+        """Repaint once with smooth scaling after the last resize event"""
+        self._resizing = False
+        self.update()
+
+    def _paint(self):
+        """Draw background and the image centered in the widget"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.BACKGROUND)
+
+        if self._image is not None and not self._image.isNull():
+            size = self._image.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(self.rect().center())
+
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, not self._resizing)
+            painter.drawImage(target, self._image)
+
+        painter.end()
+
+
+class OpenGLImageView(ImageView, QOpenGLWidget):
+    """
+    Image view painted through OpenGL
+
+    QPainter on a QOpenGLWidget draws images as textures, so scaling is
+    done by the GPU (linear filtering) instead of the CPU raster engine.
+    """
+
+    def paintGL(self):
+        """Paint with the OpenGL engine"""
+        self._paint()
+
+
+class RasterImageView(ImageView, QWidget):
+    """Image view painted by the raster engine (no OpenGL required)"""
+
+    def paintEvent(self, event):
+        """Paint with the raster engine"""
+        self._paint()
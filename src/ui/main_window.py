@@ -6,9 +6,10 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QFileDialog, QGroupBox, QGridLayout, QCheckBox,
                              QProgressBar, QSplitter, QTabWidget, QScrollArea,
                              QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, QSize
-from PyQt6.QtGui import QPixmap, QImage, QKeyEvent
+from PyQt6.QtCore import Qt, QTimer, QSignalBlocker, pyqtSignal
+from PyQt6.QtGui import QImage, QKeyEvent
 import numpy as np
+from functools import partial
 from typing import Optional, List
 
 from ..core.interfaces import IDataSource, IDetectionAlgorithm
@@ -19,11 +20,16 @@ from ..data_sources.image_sequence_source import ImageSequenceSource
 from ..data_sources.dicom_source import DicomSource
 from ..processing.no_processing import NoProcessingAlgorithm
 from ..processing.convolution import ConvolutionAlgorithm
+from .frame_renderer import FrameRenderer
+from .image_view import ImageView
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
 
+    # Emitted (from the processing thread) when the pipeline has a new frame
+    frameReady = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
@@ -39,16 +45,51 @@ class MainWindow(QMainWindow):
             ConvolutionAlgorithm()
         ]
 
-        # UI update timer
+        # UI update timer, paced to the screen refresh rate; started when the
+        # pipeline reports a new frame, so an idle pipeline causes no wakeups
         self.update_timer = QTimer()
+        self.update_timer.setSingleShot(True)
         self.update_timer.timeout.connect(self.update_display)
-        self.update_timer.setInterval(33)  # ~30 FPS
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0.0
+        self._base_update_interval = int(1000 / (refresh_rate if refresh_rate > 0 else 60.0))
+        self.update_timer.setInterval(self._base_update_interval)
+        self._update_requested = False
+        self.frameReady.connect(self.schedule_update)
+
+        # Status panel also refreshes at a low rate without new frames, so a
+        # stalled pipeline or failed source shows up instead of stale numbers
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.update_status)
+        self.status_timer.setInterval(500)
+        self.status_timer.start()
+
+        # Pipeline sequence number last shown, the frames borrowed for it and
+        # EMA of the renderer's per-frame conversion time in ms
+        self._last_seq = 0
+        self._current_frames = (None, None)
+        self._display_time_ema = 0.0
+
+        # Slider seeks are coalesced: only the latest position within one
+        # refresh period is applied
+        self._pending_seek: Optional[int] = None
+        self._seek_timer = QTimer()
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.setInterval(16)
+        self._seek_timer.timeout.connect(self._commit_seek)
+
+        # QImage conversion runs on a worker thread, scaling in ImageView
+        self.frame_renderer = FrameRenderer(self)
+        self.frame_renderer.imageReady.connect(self.on_frame_rendered)
+
+        # Frame number shown (or pending) per view: id(view) -> frame number
+        self._displayed = {}
 
         self.init_ui()
         self.setup_playback_controller()
 
-        # Start timer
-        self.update_timer.start()
+        # Start renderer
+        self.frame_renderer.start()
 
     def init_ui(self):
         """Initialize user interface"""
@@ -235,8 +276,13 @@ class MainWindow(QMainWindow):
         self.algorithm_params_widget = QWidget()
         self.algorithm_params_layout = QVBoxLayout(self.algorithm_params_widget)
         self.algorithm_params_layout.setContentsMargins(5, 5, 5, 5)
+        self.algorithm_params_layout.addStretch()
         scroll.setWidget(self.algorithm_params_widget)
 
+        # Parameter widgets reused across algorithm switches:
+        # (algorithm name, parameter name) -> (container, control, value label)
+        self._param_widgets = {}
+
         layout.addWidget(scroll)
 
         # Initialize
@@ -281,12 +327,9 @@ class MainWindow(QMainWindow):
         # Source image
         source_group = QGroupBox("Source")
         source_layout = QVBoxLayout()
-        self.source_image_label = QLabel()
-        self.source_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.source_image_label.setMinimumSize(400, 300)
-        self.source_image_label.setStyleSheet("QLabel { background-color: #1a1a1a; }")
-        self.source_image_label.setScaledContents(False)
-        source_layout.addWidget(self.source_image_label)
+        self.source_image_view = ImageView.create()
+        self.source_image_view.setMinimumSize(400, 300)
+        source_layout.addWidget(self.source_image_view)
 
         self.source_info_label = QLabel("No image")
         self.source_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -297,12 +340,9 @@ class MainWindow(QMainWindow):
         # Processed image
         processed_group = QGroupBox("Processed")
         processed_layout = QVBoxLayout()
-        self.processed_image_label = QLabel()
-        self.processed_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.processed_image_label.setMinimumSize(400, 300)
-        self.processed_image_label.setStyleSheet("QLabel { background-color: #1a1a1a; }")
-        self.processed_image_label.setScaledContents(False)
-        processed_layout.addWidget(self.processed_image_label)
+        self.processed_image_view = ImageView.create()
+        self.processed_image_view.setMinimumSize(400, 300)
+        processed_layout.addWidget(self.processed_image_view)
 
         self.processed_info_label = QLabel("No image")
         self.processed_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -344,6 +384,10 @@ class MainWindow(QMainWindow):
         self.proc_time_label = QLabel("-- ms")
         layout.addWidget(self.proc_time_label, 3, 1)
 
+        # Last applied performance colors
+        self._acq_color = None
+        self._proc_color = None
+
         group.setLayout(layout)
         return group
 
@@ -413,12 +457,18 @@ class MainWindow(QMainWindow):
                 return
             self.current_data_source = DicomSource(path)
 
+        # Frame numbers restart with the new source
+        self._displayed.clear()
+        self._last_seq = 0
+        self._current_frames = (None, None)
+
         # Create pipeline
         self.pipeline = ProcessingPipeline(
             self.current_data_source,
             self.current_algorithm,
             buffer_size=100
         )
+        self.pipeline.on_new_frame = self.on_pipeline_frame
 
         # Start pipeline
         if self.pipeline.start():
@@ -512,9 +562,20 @@ class MainWindow(QMainWindow):
                     self.playback_controller.pause()
                     self.play_pause_btn.setText("▶")
 
-                # Seek to position
-                self.current_data_source.seek(value)
-                self.playback_controller.seek(value)
+                # Seek to position (applied by the seek timer)
+                self._pending_seek = value
+                if not self._seek_timer.isActive():
+                    self._seek_timer.start()
+
+    def _commit_seek(self):
+        """Apply the latest slider position"""
+        value = self._pending_seek
+        self._pending_seek = None
+        if value is None or not self.current_data_source:
+            return
+
+        self.current_data_source.seek(value)
+        self.playback_controller.seek(value)
 
     def on_algorithm_changed(self, index):
         """Handle algorithm change"""
@@ -526,64 +587,94 @@ class MainWindow(QMainWindow):
 
     def update_algorithm_parameters(self):
         """Update algorithm parameter controls"""
-        # Clear existing
-        while self.algorithm_params_layout.count():
-            item = self.algorithm_params_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        algorithm_name = self.current_algorithm.get_name()
 
         # Get parameters
         params = self.current_algorithm.get_parameters()
 
+        # Hide controls of other algorithms (and parameters no longer offered)
+        for (algo_name, param_name), (container, _, _) in self._param_widgets.items():
+            if algo_name != algorithm_name or param_name not in params:
+                container.hide()
+
         for param_name, param_info in params.items():
-            param_layout = QVBoxLayout()
-            label = QLabel(param_info.get("label", param_name) + ":")
-            param_layout.addWidget(label)
+            key = (algorithm_name, param_name)
+            if key not in self._param_widgets:
+                self._param_widgets[key] = self.create_parameter_widget(param_name, param_info)
+                # Keep the trailing stretch last
+                container = self._param_widgets[key][0]
+                self.algorithm_params_layout.insertWidget(self.algorithm_params_layout.count() - 1, container)
+
+            container, control, value_label = self._param_widgets[key]
+            self.set_parameter_widget_value(param_info, control, value_label)
+            container.show()
+
+    def create_parameter_widget(self, param_name: str, param_info: dict):
+        """
+        Create control for one algorithm parameter
+
+        Returns:
+            Tuple (container, control, value label or None)
+        """
+        container = QWidget()
+        param_layout = QVBoxLayout(container)
+        param_layout.setContentsMargins(0, 0, 0, 0)
+        label = QLabel(param_info.get("label", param_name) + ":")
+        param_layout.addWidget(label)
+
+        param_type = param_info.get("type", "text")
+        control = None
+        value_label = None
+
+        if param_type == "choice":
+            control = QComboBox()
+            control.addItems(param_info.get("choices", []))
+            control.currentTextChanged.connect(partial(self.on_parameter_changed, param_name))
+            param_layout.addWidget(control)
+        elif param_type == "bool":
+            control = QCheckBox()
+            control.toggled.connect(partial(self.on_parameter_changed, param_name))
+            param_layout.addWidget(control)
+        elif param_type == "slider":
+            # Create slider with value label
+            slider_row = QHBoxLayout()
+
+            control = QSlider(Qt.Orientation.Horizontal)
+            control.setMinimum(param_info.get("min", 0))
+            control.setMaximum(param_info.get("max", 255))
+
+            value_label = QLabel()
+            value_label.setMinimumWidth(35)
+
+            control.valueChanged.connect(partial(self.on_slider_parameter_changed, param_name, value_label))
+
+            slider_row.addWidget(control)
+            slider_row.addWidget(value_label)
+            param_layout.addLayout(slider_row)
+
+        return container, control, value_label
+
+    def set_parameter_widget_value(self, param_info: dict, control, value_label):
+        """Show parameter value in its control without emitting change signals"""
+        if control is None:
+            return
 
-            param_type = param_info.get("type", "text")
-            value = param_info.get("value")
+        param_type = param_info.get("type", "text")
+        value = param_info.get("value")
 
+        with QSignalBlocker(control):
             if param_type == "choice":
-                combo = QComboBox()
-                combo.addItems(param_info.get("choices", []))
-                combo.setCurrentText(str(value))
-                combo.currentTextChanged.connect(
-                    lambda v, pn=param_name: self.on_parameter_changed(pn, v)
-                )
-                param_layout.addWidget(combo)
+                control.setCurrentText(str(value))
             elif param_type == "bool":
-                checkbox = QCheckBox()
-                checkbox.setChecked(bool(value))
-                checkbox.stateChanged.connect(
-                    lambda s, pn=param_name: self.on_parameter_changed(pn, s == Qt.CheckState.Checked.value)
-                )
-                param_layout.addWidget(checkbox)
+                control.setChecked(bool(value))
             elif param_type == "slider":
-                # Create slider with value label
-                slider_row = QHBoxLayout()
-
-                slider = QSlider(Qt.Orientation.Horizontal)
-                slider.setMinimum(param_info.get("min", 0))
-                slider.setMaximum(param_info.get("max", 255))
-                slider.setValue(int(value))
-
-                value_label = QLabel(str(int(value)))
-                value_label.setMinimumWidth(35)
+                control.setValue(int(value))
+                value_label.setText(str(int(value)))
 
-                slider.valueChanged.connect(
-                    lambda v, pn=param_name, lbl=value_label: (
-                        lbl.setText(str(v)),
-                        self.on_parameter_changed(pn, v)
-                    )
-                )
-
-                slider_row.addWidget(slider)
-                slider_row.addWidget(value_label)
-                param_layout.addLayout(slider_row)
-
-            self.algorithm_params_layout.addLayout(param_layout)
-
-        self.algorithm_params_layout.addStretch()
+    def on_slider_parameter_changed(self, param_name: str, value_label: QLabel, value: int):
+        """Handle slider parameter change"""
+        value_label.setText(str(value))
+        self.on_parameter_changed(param_name, value)
 
     def on_parameter_changed(self, param_name: str, value):
         """Handle parameter change"""
@@ -629,67 +720,85 @@ class MainWindow(QMainWindow):
             self.current_data_source.seek(frame_number)
 
             # Update position slider without triggering seek
-            self.position_slider.blockSignals(True)
-            self.position_slider.setValue(frame_number)
-            self.position_slider.blockSignals(False)
+            with QSignalBlocker(self.position_slider):
+                self.position_slider.setValue(frame_number)
 
             # Update position label
             total = self.playback_controller.get_total_frames()
             self.position_label.setText(f"{frame_number} / {total if total else '?'}")
 
+    def on_pipeline_frame(self, source_frame, processed_frame):
+        """Pipeline callback (processing thread): request a display update"""
+        # At most one queued signal at a time, however fast frames arrive
+        if not self._update_requested:
+            self._update_requested = True
+            self.frameReady.emit()
+
+    def schedule_update(self):
+        """Run update_display within one update interval"""
+        self._update_requested = False
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+
     def update_display(self):
         """Update displayed images"""
         if not self.pipeline:
             return
 
-        # Get latest frames
-        source_frame, processed_frame = self.pipeline.get_latest_frames()
+        # Get latest frame pair (borrowed, not copied) in a single read
+        seq, source_frame, processed_frame = self.pipeline.get_latest_frames_atomic()
 
-        # Update source image
-        if source_frame:
-            self.display_frame(source_frame.frame, self.source_image_label, self.source_info_label, source_frame.frame_number)
+        # Skip redrawing when no new frame has arrived since the last tick
+        if seq != self._last_seq:
+            self._last_seq = seq
+            # Keep the borrowed frames referenced while they are displayed
+            self._current_frames = (source_frame, processed_frame)
 
-        # Update processed image
-        if processed_frame:
-            self.display_frame(processed_frame.frame, self.processed_image_label, self.processed_info_label, processed_frame.frame_number)
+            # Update source image
+            if source_frame:
+                self.display_frame(source_frame.frame, self.source_image_view, self.source_info_label, source_frame.frame_number)
+
+            # Update processed image
+            if processed_frame:
+                self.display_frame(processed_frame.frame, self.processed_image_view, self.processed_info_label, processed_frame.frame_number)
 
         # Update status
         self.update_status()
 
-    def display_frame(self, frame: np.ndarray, label: QLabel, info_label: QLabel, frame_number: int):
-        """Display frame on label"""
+    def _adapt_update_interval(self, render_time_ms: float):
+        """Widen the update interval while rendering takes longer than it allows"""
+        self._display_time_ema += 0.1 * (render_time_ms - self._display_time_ema)
+
+        # Leave at least half of each interval for event handling
+        interval = max(self._base_update_interval, int(2 * self._display_time_ema))
+        if interval != self.update_timer.interval():
+            self.update_timer.setInterval(interval)
+
+    def display_frame(self, frame: np.ndarray, view: ImageView, info_label: QLabel, frame_number: int):
+        """Display frame in image view"""
         if frame is None or frame.size == 0:
             return
 
-        # Make a copy to ensure data isn't garbage collected
-        frame = frame.copy()
+        # Nothing would be drawn for a hidden or fully covered pane
+        if not view.isVisible() or view.visibleRegion().isEmpty():
+            return
 
-        # Convert to QImage
-        height, width = frame.shape[:2]
+        # View already shows (or has pending) this frame; resizing is handled
+        # by the view itself, scaling at paint time
+        if self._displayed.get(id(view)) == frame_number:
+            return
+        self._displayed[id(view)] = frame_number
 
-        if len(frame.shape) == 3:
-            # RGB - ensure contiguous array
-            if not frame.flags['C_CONTIGUOUS']:
-                frame = np.ascontiguousarray(frame)
-            bytes_per_line = 3 * width
-            q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888).copy()
-        else:
-            # Grayscale
-            if not frame.flags['C_CONTIGUOUS']:
-                frame = np.ascontiguousarray(frame)
-            bytes_per_line = width
-            q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_Grayscale8).copy()
-
-        # Scale to fit label
-        pixmap = QPixmap.fromImage(q_image)
-        scaled_pixmap = pixmap.scaled(
-            label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        # Convert on the renderer thread, shown in on_frame_rendered
+        height, width = frame.shape[:2]
+        self.frame_renderer.submit(id(view), frame, (view, info_label, frame_number, width, height))
 
-        label.setPixmap(scaled_pixmap)
+    def on_frame_rendered(self, tag, image: QImage, render_time_ms: float):
+        """Show a frame converted by the renderer thread"""
+        view, info_label, frame_number, width, height = tag
+        view.set_image(image)
         info_label.setText(f"Frame {frame_number} - {width}x{height}")
+        self._adapt_update_interval(render_time_ms)
 
     def update_status(self):
         """Update status panel"""
@@ -698,31 +807,42 @@ class MainWindow(QMainWindow):
 
         buffer_info = self.pipeline.get_buffer_info()
 
-        # Cache progress
-        fill_pct = buffer_info.get('source_fill', 0)
-        self.cache_progress.setValue(int(fill_pct))
+        # Cache progress (setters repaint even for unchanged values)
+        fill_pct = int(buffer_info.get('source_fill', 0))
+        if fill_pct != self.cache_progress.value():
+            self.cache_progress.setValue(fill_pct)
 
         # Performance
         acq_time = buffer_info.get('acquisition_time_ms', 0)
         proc_time = buffer_info.get('processing_time_ms', 0)
 
-        self.acq_time_label.setText(f"{acq_time:.1f} ms")
-        self.proc_time_label.setText(f"{proc_time:.1f} ms")
-
-        # Color code performance
-        if acq_time > 100:
-            self.acq_time_label.setStyleSheet("color: red;")
-        elif acq_time > 50:
-            self.acq_time_label.setStyleSheet("color: orange;")
-        else:
-            self.acq_time_label.setStyleSheet("color: green;")
-
-        if proc_time > 100:
-            self.proc_time_label.setStyleSheet("color: red;")
-        elif proc_time > 50:
-            self.proc_time_label.setStyleSheet("color: orange;")
-        else:
-            self.proc_time_label.setStyleSheet("color: green;")
+        acq_text = f"{acq_time:.1f} ms"
+        if acq_text != self.acq_time_label.text():
+            self.acq_time_label.setText(acq_text)
+        proc_text = f"{proc_time:.1f} ms"
+        if proc_text != self.proc_time_label.text():
+            self.proc_time_label.setText(proc_text)
+
+        # Color code performance (style sheets are re-parsed on every set,
+        # so only apply them when the color changes)
+        acq_color = self._performance_color(acq_time)
+        if acq_color != self._acq_color:
+            self.acq_time_label.setStyleSheet(f"color: {acq_color};")
+            self._acq_color = acq_color
+
+        proc_color = self._performance_color(proc_time)
+        if proc_color != self._proc_color:
+            self.proc_time_label.setStyleSheet(f"color: {proc_color};")
+            self._proc_color = proc_color
+
+    @staticmethod
+    def _performance_color(time_ms: float) -> str:
+        """Status color for a per-frame time"""
+        if time_ms > 100:
+            return "red"
+        if time_ms > 50:
+            return "orange"
+        return "green"
 
     def keyPressEvent(self, event: QKeyEvent):
         """Handle keyboard shortcuts"""
@@ -739,5 +859,6 @@ class MainWindow(QMainWindow):
         """Handle window close"""
         if self.pipeline:
             self.pipeline.stop()
+        self.frame_renderer.stop()
         event.accept()
 
@@ -0,0 +1,66 @@
+"""
+Tests for image sequence source pacing and cache
+"""
+import cv2
+import numpy as np
+import pytest
+
+from src.data_sources.image_sequence_source import ImageSequenceSource
+
+
+@pytest.fixture
+def sequence_folder(tmp_path):
+    """Folder with three small PNG frames of distinct colors"""
+    for i in range(3):
+        frame = np.full((8, 12, 3), i * 50, dtype=np.uint8)
+        cv2.imwrite(str(tmp_path / f"frame_{i:06d}.png"), frame)
+    return tmp_path
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "prefetch"])
+def source(request, sequence_folder):
+    """Opened source, with or without the prefetch executor"""
+    source = ImageSequenceSource(str(sequence_folder))
+    assert source.open()
+    if request.param:
+        source.start()
+    yield source
+    source.close()
+
+
+def test_unchanged_position_returns_no_new_frame(source):
+    assert source.read_frame() is not None
+    assert source.read_frame() is None
+
+
+def test_cached_frame_unchanged_position_returns_no_new_frame(source):
+    source.read_frame()
+    source.seek(1)
+    source.read_frame()
+
+    # Frame 0 is now served from the cache
+    source.seek(0)
+    frame = source.read_frame()
+    assert frame is not None
+    assert frame[0, 0, 0] == 0
+    assert source.read_frame() is None
+
+
+def test_seek_to_same_position_returns_frame_again(source):
+    first = source.read_frame()
+    source.seek(0)
+    assert np.array_equal(source.read_frame(), first)
+
+
+def test_cache_bounded_by_bytes(sequence_folder):
+    frame_bytes = 8 * 12 * 3
+    source = ImageSequenceSource(str(sequence_folder), cache_bytes=2 * frame_bytes)
+    assert source.open()
+
+    for position in range(3):
+        source.seek(position)
+        source.read_frame()
+
+    assert list(source._cache) == [1, 2]
+    assert source._cache_nbytes == 2 * frame_bytes
+    source.close()